@@ -9,19 +9,26 @@ Usage:
   python generate_launch_images.py
 """
 
+import hashlib
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def _import_cairosvg():
+    """Import cairosvg lazily, installing it on first use if missing.
+
+    Deferred so the script doesn't pay the cairosvg/cffi import cost
+    when it bails out early (e.g. missing SVG).
+    """
+    try:
+        import cairosvg
+    except ImportError:
+        print("Installing required packages...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow", "cairosvg"])
+        import cairosvg
+    return cairosvg
 
-# Check for required packages
-try:
-    from PIL import Image
-    import cairosvg
-except ImportError:
-    print("Installing required packages...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow", "cairosvg"])
-    from PIL import Image
-    import cairosvg
 
 # Output directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -40,31 +47,66 @@ SIZES = {
 
 def generate_images():
     """Generate launch images from SVG at different scales."""
-    
+
     if not os.path.exists(SVG_PATH):
         print(f"Error: SVG file not found at {SVG_PATH}")
         print("Please create the SVG first or update the path.")
         return False
-    
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    for filename, (width, height) in SIZES.items():
+
+    # Read the SVG once; each svg2png call re-parses a url= source,
+    # so feed all renders from the same in-memory bytes.
+    with open(SVG_PATH, "rb") as f:
+        svg_bytes = f.read()
+
+    # Skip regeneration entirely when the source SVG is unchanged and all
+    # outputs are already present.
+    src_hash = hashlib.blake2b(svg_bytes, digest_size=16).hexdigest()
+    hash_path = os.path.join(OUTPUT_DIR, ".src.hash")
+    outputs_ok = all(
+        os.path.isfile(os.path.join(OUTPUT_DIR, filename))
+        and os.path.getsize(os.path.join(OUTPUT_DIR, filename)) > 0
+        for filename in SIZES
+    )
+    if outputs_ok and os.path.isfile(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == src_hash:
+                print("Launch images up to date (source SVG unchanged), skipping.")
+                return True
+
+    cairosvg = _import_cairosvg()
+
+    def render(filename, width, height):
         output_path = os.path.join(OUTPUT_DIR, filename)
-        print(f"Generating {filename} ({width}x{height})...")
-        
-        try:
-            # Convert SVG to PNG at specified size
-            cairosvg.svg2png(
-                url=SVG_PATH,
-                write_to=output_path,
-                output_width=width,
-                output_height=height,
-            )
-            print(f"  ✓ Saved to {output_path}")
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            return False
+        # Convert SVG to PNG at specified size
+        cairosvg.svg2png(
+            bytestring=svg_bytes,
+            write_to=output_path,
+            output_width=width,
+            output_height=height,
+        )
+        return output_path
+
+    # The three renders are independent and Cairo releases the GIL while
+    # rasterizing, so run them on a small thread pool.
+    with ThreadPoolExecutor(max_workers=len(SIZES)) as executor:
+        futures = {
+            executor.submit(render, filename, width, height): (filename, width, height)
+            for filename, (width, height) in SIZES.items()
+        }
+        for future in as_completed(futures):
+            filename, width, height = futures[future]
+            try:
+                output_path = future.result()
+                print(f"  ✓ {filename} ({width}x{height}) saved to {output_path}")
+            except Exception as e:
+                print(f"  ✗ {filename}: {e}")
+                return False
     
+    with open(hash_path, "w") as f:
+        f.write(src_hash + "\n")
+
     print("\n✅ All launch images generated successfully!")
     print(f"   Output directory: {OUTPUT_DIR}")
     return True
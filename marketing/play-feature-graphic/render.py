@@ -1,17 +1,16 @@
 #!/usr/bin/env python3
 """
 Generate Play Store Feature Graphic PNG from HTML template.
-Uses Playwright CLI to capture a screenshot at exactly 1024x500.
+Uses the Playwright Python API to capture a screenshot at exactly 1024x500.
 
 Usage:
     python marketing/play-feature-graphic/render.py
-    
+
 Requirements:
     pip install playwright
     playwright install chromium
 """
 
-import subprocess
 from pathlib import Path
 
 
@@ -22,27 +21,49 @@ HTML_FILE = SCRIPT_DIR / "index.html"
 OUTPUT_FILE = SCRIPT_DIR / "feature-graphic-1024x500.png"
 
 
-def capture_screenshot():
-    """Capture the feature graphic at 1024x500."""
+def capture_screenshot(browser=None):
+    """Capture the feature graphic at 1024x500.
+
+    Pass an already-launched Playwright browser to reuse it across
+    multiple captures; otherwise one is launched for this call.
+    """
     print("🎨 Generating Play Store Feature Graphic...")
     print(f"   Source: {HTML_FILE.relative_to(PROJECT_ROOT)}")
     print(f"   Output: {OUTPUT_FILE.relative_to(PROJECT_ROOT)}")
-    
-    # Use playwright CLI to screenshot at exact dimensions
-    cmd = [
-        "playwright", "screenshot",
-        "--viewport-size", "1024,500",
-        "--wait-for-timeout", "2000",
-        f"file://{HTML_FILE.absolute()}",
-        str(OUTPUT_FILE)
-    ]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print(f"❌ Error: {result.stderr}")
+
+    from playwright.sync_api import sync_playwright
+
+    # Feed the HTML to the page directly rather than navigating file://;
+    # a <base> tag keeps the template's relative asset paths resolving.
+    html = HTML_FILE.read_text(encoding="utf-8")
+    base_tag = f'<base href="{HTML_FILE.parent.absolute().as_uri()}/">'
+    html = html.replace("<head>", f"<head>\n  {base_tag}", 1)
+
+    def shoot(browser):
+        context = browser.new_context(
+            viewport={"width": 1024, "height": 500},
+            device_scale_factor=1,
+        )
+        page = context.new_page()
+        page.set_content(html, wait_until="networkidle")
+        # Web fonts can finish loading after networkidle; wait for them so
+        # the capture never races the font swap.
+        page.evaluate("document.fonts ? document.fonts.ready : true")
+        page.screenshot(path=str(OUTPUT_FILE))
+        context.close()
+
+    try:
+        if browser is not None:
+            shoot(browser)
+        else:
+            with sync_playwright() as p:
+                own_browser = p.chromium.launch(headless=True)
+                shoot(own_browser)
+                own_browser.close()
+    except Exception as e:
+        print(f"❌ Error: {e}")
         return False
-    
+
     # Verify dimensions
     try:
         from PIL import Image
@@ -54,7 +75,7 @@ def capture_screenshot():
                 print(f"⚠️  Warning: Image is {width}x{height}, expected 1024x500")
     except ImportError:
         print(f"✅ Screenshot saved (install Pillow to verify dimensions)")
-    
+
     print(f"\n📁 Output: {OUTPUT_FILE}")
     return True
 
@@ -24,19 +24,26 @@ Environment variables:
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import os
+import pathlib
 import sys
+import tempfile
+import time
 from datetime import datetime, timezone
 from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import urllib.error
+import urllib.request
+
 try:
-    import urllib.request
-    import urllib.error
-    HAS_URLLIB = True
+    import orjson
 except ImportError:
-    HAS_URLLIB = False
+    orjson = None
 
 
 # ---------------------------------------------------------------------------
@@ -134,17 +141,34 @@ CYAN = "\033[96m"
 WHITE = "\033[97m"
 
 
-def style(code: str, text: str) -> str:
-    """Wrap *text* in ANSI colour if stdout is a TTY."""
-    if NO_COLOR:
+if NO_COLOR:
+    def style(code: str, text: str) -> str:
+        """Return *text* unchanged (colour disabled)."""
         return text
-    return code + text + RESET
+else:
+    def style(code: str, text: str) -> str:
+        """Wrap *text* in ANSI colour codes."""
+        return f"{code}{text}{RESET}"
+
+
+# Styled fragments that are identical on every report -- build them once
+# rather than re-wrapping the same literals per print call.
+_WIDTH = 60
+_DIVIDER = style(DIM, "  " + "-" * _WIDTH)
+_BAR_CYAN = style(BOLD + CYAN, "  " + "=" * _WIDTH)
+_BAR_YELLOW = style(BOLD + YELLOW, "  " + "=" * _WIDTH)
 
 
 # ---------------------------------------------------------------------------
 # Calculation engine
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=16)
+def _days_in_month(year: int, month: int) -> int:
+    """Memoized monthrange lookup; free when the script is run in a loop."""
+    return monthrange(year, month)[1]
+
+
 def calculate_bill(
     usage_percent: float,
     plan_key: str = "pro_plus",
@@ -180,19 +204,78 @@ def calculate_bill(
     }
 
 
+def calculate_bill_vec(
+    usage_percents,
+    plan_key: str = "pro_plus",
+    billing_cycle: str = "monthly",
+) -> dict:
+    """Vectorized :func:`calculate_bill` over an array of usage percentages.
+
+    Accepts any sequence of percentages and returns a dict of NumPy
+    arrays (total_requests, overage_requests, overage_cost, total_cost)
+    plus the scalar plan constants. Intended for what-if sweeps where
+    calling calculate_bill per value would dominate.
+    """
+    import numpy as np  # deferred: the interactive CLI never needs it
+
+    plan = PLANS[plan_key]
+    included = plan["included_premium"]
+
+    base_cost = plan["monthly_cost"]
+    if billing_cycle == "yearly" and "yearly_cost" in plan:
+        base_cost = plan["yearly_cost"] / 12  # amortised monthly
+
+    pct = np.asarray(usage_percents, dtype=np.float64)
+    total_used = pct * (included / 100.0)
+    overage = np.maximum(0.0, total_used - included)
+    rate = plan["overage_rate"] if plan["overage_enabled"] else 0.0
+    overage_cost = overage * rate
+    total_cost = base_cost + overage_cost
+
+    return {
+        "plan": plan["name"],
+        "billing_cycle": billing_cycle,
+        "base_cost": round(base_cost, 2),
+        "included_premium": included,
+        "usage_percent": pct,
+        "total_requests": np.round(total_used),
+        "overage_requests": np.round(overage),
+        "overage_rate": rate,
+        "overage_cost": np.round(overage_cost, 2),
+        "total_cost": np.round(total_cost, 2),
+    }
+
+
 def project_end_of_month(
     usage_percent: float,
     current_day: int,
     days_in_month: int,
     plan_key: str = "pro_plus",
     billing_cycle: str = "monthly",
+    current_bill: Optional[dict] = None,
 ) -> dict:
-    """Project end-of-month cost at the current daily burn rate."""
+    """Project end-of-month cost at the current daily burn rate.
+
+    When *current_bill* (the already-computed breakdown for
+    *usage_percent*) is supplied and no days remain, it is reused
+    instead of recomputing an identical bill.
+    """
     plan = PLANS[plan_key]
     included = plan["included_premium"]
     total_used_so_far = usage_percent / 100.0 * included
     daily_rate = total_used_so_far / current_day if current_day > 0 else 0
     remaining_days = days_in_month - current_day
+
+    if remaining_days <= 0 and current_bill is not None:
+        # Last-day case: the projection equals the current bill.
+        return {
+            **current_bill,
+            "daily_burn_rate": round(daily_rate, 1),
+            "remaining_days": remaining_days,
+            "projected_total_requests": round(total_used_so_far),
+            "projected_percent": round(usage_percent, 1),
+        }
+
     projected_total = total_used_so_far + (daily_rate * remaining_days)
     projected_percent = (projected_total / included) * 100 if included else 0
 
@@ -208,6 +291,29 @@ def project_end_of_month(
 # GitHub API helper
 # ---------------------------------------------------------------------------
 
+_CACHE_DIR = pathlib.Path(tempfile.gettempdir()) / "copilot_usage_cache"
+_CACHE_TTL = 300  # seconds
+
+
+def _cache_get(key: str, ttl: int = _CACHE_TTL) -> Optional[dict]:
+    """Return a cached API response younger than *ttl*, or None."""
+    path = _CACHE_DIR / (key + ".json")
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_put(key: str, data: dict) -> None:
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (_CACHE_DIR / (key + ".json")).write_text(json.dumps(data))
+    except OSError:
+        pass  # cache is best-effort
+
+
 def fetch_copilot_info(token: str) -> Optional[dict]:
     """Attempt to fetch Copilot subscription info via the GitHub API.
 
@@ -215,8 +321,12 @@ def fetch_copilot_info(token: str) -> Optional[dict]:
     The individual Copilot usage percentage is not currently exposed
     via the REST API -- you must read it from github.com/settings/copilot.
     """
-    if not HAS_URLLIB:
-        return None
+    # Re-running the script within a few minutes shouldn't re-spend API
+    # quota on data that doesn't change mid-session.
+    cache_key = hashlib.sha256(token.encode()).hexdigest()[:16] + "-user"
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
 
     headers = {
         "Accept": "application/vnd.github+json",
@@ -224,34 +334,58 @@ def fetch_copilot_info(token: str) -> Optional[dict]:
         "X-GitHub-Api-Version": "2022-11-28",
     }
 
-    req = urllib.request.Request(
-        "https://api.github.com/user",
-        headers=headers,
-    )
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            user_data = json.loads(resp.read().decode())
-    except (urllib.error.URLError, urllib.error.HTTPError) as e:
-        print(style(RED, "  API error: " + str(e)), file=sys.stderr)
-        return None
+        import httpx
+    except ImportError:
+        httpx = None
 
-    return {
+    if httpx is not None:
+        # httpx keeps the TLS connection warm for any follow-up endpoint
+        # calls and can multiplex them over HTTP/2 when h2 is installed.
+        try:
+            try:
+                client = httpx.Client(http2=True, timeout=10, headers=headers)
+            except ImportError:  # http2 extra (h2) not installed
+                client = httpx.Client(timeout=10, headers=headers)
+            with client:
+                resp = client.get("https://api.github.com/user")
+                resp.raise_for_status()
+                user_data = resp.json()
+        except httpx.HTTPError as e:
+            print(style(RED, "  API error: " + str(e)), file=sys.stderr)
+            return None
+    else:
+        req = urllib.request.Request(
+            "https://api.github.com/user",
+            headers=headers,
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                raw = resp.read()
+                user_data = orjson.loads(raw) if orjson else json.loads(raw)
+        except (urllib.error.URLError, urllib.error.HTTPError) as e:
+            print(style(RED, "  API error: " + str(e)), file=sys.stderr)
+            return None
+
+    info = {
         "login": user_data.get("login", "unknown"),
         "plan_name": user_data.get("plan", {}).get("name", "unknown"),
     }
+    _cache_put(cache_key, info)
+    return info
 
 
 # ---------------------------------------------------------------------------
 # Display helpers
 # ---------------------------------------------------------------------------
 
-def divider(width: int = 60) -> None:
-    print(style(DIM, "  " + "-" * width))
+def divider(width: int = _WIDTH) -> str:
+    return _DIVIDER if width == _WIDTH else style(DIM, "  " + "-" * width)
 
 
 def usage_color(pct: float) -> str:
     """Return a coloured percentage string."""
-    text = "{:.1f}%".format(pct)
+    text = f"{pct:.1f}%"
     if pct <= 100:
         return style(GREEN, text)
     elif pct <= 200:
@@ -261,88 +395,107 @@ def usage_color(pct: float) -> str:
 
 
 def money(amount: float) -> str:
-    return "${:.2f}".format(amount)
+    return f"${amount:.2f}"
+
 
+def row(label: str, value: str, label_w: int = 35) -> str:
+    return f"  {label:<{label_w}} {value}"
 
-def row(label: str, value: str, label_w: int = 35) -> None:
-    print("  {:<{w}} {}".format(label, value, w=label_w))
+
+def _emit(lines: list) -> None:
+    """Write a whole report section with a single stdout write."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_bill(bill: dict, title: str = "CURRENT USAGE") -> None:
     """Pretty-print a cost breakdown."""
-    w = 60
-    bar = "=" * w
-    print()
-    print(style(BOLD + CYAN, "  " + bar))
-    print(style(BOLD + CYAN, "  " + title.center(w)))
-    print(style(BOLD + CYAN, "  " + bar))
-    print()
-
-    row("Plan:", style(WHITE, bill["plan"]))
-    row("Billing cycle:", bill["billing_cycle"])
-    divider()
-    row("Base subscription:", style(WHITE, money(bill["base_cost"])))
-    row("Included premium requests:", style(WHITE, "{:,}".format(bill["included_premium"])))
-    row("Usage:", usage_color(bill["usage_percent"]))
-    row("Total premium requests used:", style(WHITE, "{:,}".format(bill["total_requests"])))
+    out = [
+        "",
+        _BAR_CYAN,
+        style(BOLD + CYAN, "  " + title.center(_WIDTH)),
+        _BAR_CYAN,
+        "",
+        row("Plan:", style(WHITE, bill["plan"])),
+        row("Billing cycle:", bill["billing_cycle"]),
+        divider(),
+        row("Base subscription:", style(WHITE, money(bill["base_cost"]))),
+        row("Included premium requests:", style(WHITE, f"{bill['included_premium']:,}")),
+        row("Usage:", usage_color(bill["usage_percent"])),
+        row("Total premium requests used:", style(WHITE, f"{bill['total_requests']:,}")),
+    ]
 
     if bill["overage_requests"] > 0:
-        divider()
-        row("Overage requests:", style(YELLOW, "{:,}".format(bill["overage_requests"])))
-        row("Overage rate:", money(bill["overage_rate"]) + "/request")
-        row("Overage cost:", style(RED, money(bill["overage_cost"])))
+        out += [
+            divider(),
+            row("Overage requests:", style(YELLOW, f"{bill['overage_requests']:,}")),
+            row("Overage rate:", money(bill["overage_rate"]) + "/request"),
+            row("Overage cost:", style(RED, money(bill["overage_cost"]))),
+        ]
 
-    divider()
     total_clr = GREEN if bill["total_cost"] <= bill["base_cost"] else RED
-    row("ESTIMATED TOTAL:", style(BOLD + total_clr, money(bill["total_cost"])))
-    print()
+    out += [
+        divider(),
+        row("ESTIMATED TOTAL:", style(BOLD + total_clr, money(bill["total_cost"]))),
+        "",
+    ]
+    _emit(out)
 
 
 def print_projection(proj: dict) -> None:
     """Pretty-print an end-of-month projection."""
-    w = 60
-    bar = "=" * w
-    print(style(BOLD + YELLOW, "  " + bar))
-    print(style(BOLD + YELLOW, "  " + "END-OF-MONTH PROJECTION".center(w)))
-    print(style(BOLD + YELLOW, "  " + bar))
-    print()
-
-    row("Daily burn rate:", style(WHITE, "{:,.1f} requests/day".format(proj["daily_burn_rate"])))
-    row("Remaining days in month:", style(WHITE, str(proj["remaining_days"])))
-    row("Projected total requests:", style(WHITE, "{:,}".format(proj["projected_total_requests"])))
-    row("Projected usage:", usage_color(proj["projected_percent"]))
+    out = [
+        _BAR_YELLOW,
+        style(BOLD + YELLOW, "  " + "END-OF-MONTH PROJECTION".center(_WIDTH)),
+        _BAR_YELLOW,
+        "",
+        row("Daily burn rate:", style(WHITE, f"{proj['daily_burn_rate']:,.1f} requests/day")),
+        row("Remaining days in month:", style(WHITE, str(proj["remaining_days"]))),
+        row("Projected total requests:", style(WHITE, f"{proj['projected_total_requests']:,}")),
+        row("Projected usage:", usage_color(proj["projected_percent"])),
+    ]
 
     if proj["overage_requests"] > 0:
-        divider()
-        row("Projected overage requests:", style(YELLOW, "{:,}".format(proj["overage_requests"])))
-        row("Projected overage cost:", style(RED, money(proj["overage_cost"])))
+        out += [
+            divider(),
+            row("Projected overage requests:", style(YELLOW, f"{proj['overage_requests']:,}")),
+            row("Projected overage cost:", style(RED, money(proj["overage_cost"]))),
+        ]
 
-    divider()
     total_clr = GREEN if proj["total_cost"] <= proj["base_cost"] else RED
-    row("PROJECTED MONTHLY TOTAL:", style(BOLD + total_clr, money(proj["total_cost"])))
-    print()
+    out += [
+        divider(),
+        row("PROJECTED MONTHLY TOTAL:", style(BOLD + total_clr, money(proj["total_cost"]))),
+        "",
+    ]
+    _emit(out)
 
 
 def print_budget_alert(bill: dict, budget: float) -> None:
     """Print a budget warning if cost exceeds the budget."""
     total = bill["total_cost"]
     if total > budget:
-        pct_over = ((total - budget) / budget) * 100
-        print(style(BOLD + RED, "  *** BUDGET ALERT ***"))
         over = total - budget
-        print(style(RED, "  Total {} exceeds budget {} by {} ({:.0f}%)".format(
-            money(total), money(budget), money(over), pct_over)))
-        print()
+        pct_over = (over / budget) * 100
+        _emit([
+            style(BOLD + RED, "  *** BUDGET ALERT ***"),
+            style(RED, f"  Total {money(total)} exceeds budget {money(budget)} "
+                       f"by {money(over)} ({pct_over:.0f}%)"),
+            "",
+        ])
     elif bill["overage_cost"] > 0:
         remaining_budget = budget - total
         rate = bill["overage_rate"]
         remaining_reqs = remaining_budget / rate if rate else 0
-        print(style(YELLOW, "  Budget remaining: {} (~{:,.0f} more premium requests)".format(
-            money(remaining_budget), remaining_reqs)))
-        print()
+        _emit([
+            style(YELLOW, f"  Budget remaining: {money(remaining_budget)} "
+                          f"(~{remaining_reqs:,.0f} more premium requests)"),
+            "",
+        ])
     else:
-        print(style(GREEN, "  Within budget. {} remaining.".format(money(budget - total))))
-        print()
+        _emit([
+            style(GREEN, f"  Within budget. {money(budget - total)} remaining."),
+            "",
+        ])
 
 
 def print_json_output(bill: dict, projection: Optional[dict] = None) -> None:
@@ -350,7 +503,10 @@ def print_json_output(bill: dict, projection: Optional[dict] = None) -> None:
     output = {"current": bill}
     if projection:
         output["projection"] = projection
-    print(json.dumps(output, indent=2))
+    if orjson:
+        print(orjson.dumps(output, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(output, indent=2))
 
 
 # ---------------------------------------------------------------------------
@@ -427,22 +583,23 @@ def main() -> None:
     # Resolve usage percentage
     usage_percent = args.percent
 
-    # If we have a token but no percentage, try to get user info
+    # If we have a token but no percentage, look up user info in the
+    # background so the API round-trip overlaps the interactive prompt
+    # instead of blocking before it.
+    info_future = None
+    executor = None
     if token and usage_percent is None:
         print(style(DIM, "  Fetching Copilot info from GitHub API..."))
-        info = fetch_copilot_info(token)
-        if info:
-            print(style(GREEN, "  Authenticated as: " + info["login"]))
-            print()
-            print(style(YELLOW, "  Note: The GitHub API does not expose individual premium"))
-            print(style(YELLOW, "  request usage percentage. Please provide it manually."))
-            print(style(YELLOW, "  Visit: https://github.com/settings/copilot"))
-            print()
+        executor = ThreadPoolExecutor(max_workers=1)
+        info_future = executor.submit(fetch_copilot_info, token)
 
     if usage_percent is None:
         print(style(CYAN, "  Enter your premium request usage percentage"))
         print(style(DIM, "  (from https://github.com/settings/copilot)"))
         print()
+        print(style(YELLOW, "  Note: The GitHub API does not expose individual premium"))
+        print(style(YELLOW, "  request usage percentage; it must be provided manually."))
+        print()
         try:
             raw = input("  Usage %: ").strip().rstrip("%")
             usage_percent = float(raw)
@@ -450,10 +607,17 @@ def main() -> None:
             print(style(RED, "  Invalid input. Please enter a number like 423.2"))
             sys.exit(1)
 
+    if info_future is not None:
+        info = info_future.result()
+        executor.shutdown()
+        if info:
+            print(style(GREEN, "  Authenticated as: " + info["login"]))
+            print()
+
     # Resolve day-of-month for projection
     now = datetime.now(timezone.utc)
     current_day = args.day if args.day is not None else now.day
-    days_in_month = args.days_in_month or monthrange(now.year, now.month)[1]
+    days_in_month = args.days_in_month or _days_in_month(now.year, now.month)
 
     # Calculate current bill
     bill = calculate_bill(usage_percent, args.plan, args.billing)
@@ -463,7 +627,7 @@ def main() -> None:
     if current_day < days_in_month:
         projection = project_end_of_month(
             usage_percent, current_day, days_in_month,
-            args.plan, args.billing,
+            args.plan, args.billing, current_bill=bill,
         )
 
     # Output
@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """
 Generate iOS launch screen images from HTML template.
-Uses Playwright CLI to capture screenshots at different iOS device sizes.
+Uses the async Playwright API to capture screenshots at different iOS
+device sizes from a single Chromium instance.
 
 Usage:
     python scripts/generate_launch_screens.py
 """
 
-import re
-import subprocess
+import asyncio
+import os
 from pathlib import Path
 
 
@@ -28,67 +29,87 @@ OUTPUT_DIR = PROJECT_ROOT / "ios" / "Runner" / "Assets.xcassets" / "LaunchImage.
 
 
 def get_version_from_pubspec() -> str:
-    """Extract full version from pubspec.yaml (including build number)."""
-    content = PUBSPEC_FILE.read_text()
-    match = re.search(r'^version:\s*(\d+\.\d+\.\d+\+\d+)', content, re.MULTILINE)
-    if match:
-        return match.group(1)
+    """Extract full version from pubspec.yaml (including build number).
+
+    Uses PyYAML's libyaml-backed loader when available so quoted or
+    commented version values parse correctly; falls back to a plain
+    line scan when PyYAML isn't installed.
+    """
+    try:
+        import yaml
+    except ImportError:
+        yaml = None
+
+    if yaml is not None:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        data = yaml.load(PUBSPEC_FILE.read_text(), Loader=loader)
+        version = str((data or {}).get("version") or "").strip()
+        return version or "1.0.0"
+
+    with PUBSPEC_FILE.open() as f:
+        for line in f:
+            if line.startswith("version:"):
+                version = line.split(":", 1)[1].strip()
+                if version:
+                    return version.split()[0]
     return "1.0.0"
 
 
-def update_html_version(html_content: str, version: str) -> str:
-    """Update version in HTML content."""
-    # Match "Version" with optional version number after it
-    return re.sub(
-        r'<div class="version">Version(?:\s+[\d.+]+)?</div>',
-        f'<div class="version">Version {version}</div>',
-        html_content
+async def _shoot(browser, html: str, name: str, width: int, height: int) -> None:
+    """Capture one launch screen size in its own browser context."""
+    context = await browser.new_context(
+        viewport={"width": width, "height": height},
+        device_scale_factor=1,
     )
+    try:
+        page = await context.new_page()
+        await page.set_content(html, wait_until="networkidle")
+        # Event-driven wait: fonts can land after networkidle.
+        await page.evaluate("document.fonts ? document.fonts.ready : true")
+        output_path = OUTPUT_DIR / f"{name}.png"
+        # Take the PNG as bytes and write it through a raw fd, skipping
+        # Playwright's own path handling and Python's buffered IO layer.
+        png = await page.screenshot(type="png")
+        fd = os.open(str(output_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, png)
+        finally:
+            os.close(fd)
+        print(f"    ✅ {name} ({width}x{height}) saved to {output_path.relative_to(PROJECT_ROOT)}")
+    finally:
+        await context.close()
+
 
+async def capture_screenshots():
+    """Capture screenshots at all iOS sizes concurrently."""
+    from playwright.async_api import async_playwright
 
-def capture_screenshots():
-    """Capture screenshots at all iOS sizes using playwright CLI."""
     version = get_version_from_pubspec()
     print(f"📱 Generating launch screens for version {version}")
-    
-    # Read and update HTML with version
-    html_content = HTML_FILE.read_text()
-    html_content = update_html_version(html_content, version)
-    
-    # Update source HTML file with version
-    HTML_FILE.write_text(html_content)
-    print(f"  ✏️  Updated {HTML_FILE.relative_to(PROJECT_ROOT)} with version {version}")
-    
-    # Write updated HTML to temp file
-    temp_html = HTML_FILE.parent / "launch_screen_temp.html"
-    temp_html.write_text(html_content)
-    
-    for name, (width, height) in IOS_SIZES.items():
-        print(f"  📸 Capturing {name} ({width}x{height})...")
-        
-        output_path = OUTPUT_DIR / f"{name}.png"
-        
-        # Use playwright CLI to screenshot
-        cmd = [
-            "playwright", "screenshot",
-            "--viewport-size", f"{width},{height}",
-            "--wait-for-timeout", "3000",
-            f"file://{temp_html.absolute()}",
-            str(output_path)
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"    ❌ Error: {result.stderr}")
-        else:
-            print(f"    ✅ Saved to {output_path.relative_to(PROJECT_ROOT)}")
-    
-    # Cleanup temp file
-    if temp_html.exists():
-        temp_html.unlink()
-    
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Render the version into the template in memory and hand the HTML
+    # straight to the page -- no temp file, no file:// navigation. The
+    # source template keeps its {{VERSION}} placeholder.
+    html = HTML_FILE.read_text().replace("{{VERSION}}", version)
+    base_tag = f'<base href="{HTML_FILE.parent.absolute().as_uri()}/">'
+    html = html.replace("<head>", f"<head>\n  {base_tag}", 1)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        # Each size gets its own context so viewports stay isolated;
+        # the waits overlap instead of running back to back.
+        await asyncio.gather(
+            *[
+                _shoot(browser, html, name, width, height)
+                for name, (width, height) in IOS_SIZES.items()
+            ]
+        )
+        await browser.close()
+
     print(f"\n✨ Done! Generated {len(IOS_SIZES)} launch screen images.")
 
 
 if __name__ == "__main__":
-    capture_screenshots()
\ No newline at end of file
+    asyncio.run(capture_screenshots())
@@ -16,11 +16,13 @@ Notes:
 import argparse
 import html as _html
 import os
+import queue
 import smtplib
 import sys
-from datetime import datetime, timedelta
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
 
 try:
     from dotenv import load_dotenv
@@ -37,138 +39,31 @@ SMTP_PORT = int(os.getenv("IMPROVMX_SMTP_PORT", "587"))
 SMTP_USER = os.getenv("IMPROVMX_SMTP_USER")
 SMTP_PASS = os.getenv("IMPROVMX_SMTP_PASS")
 SMTP_STARTTLS = os.getenv("IMPROVMX_SMTP_STARTTLS", "true").lower() == "true"
-FROM_EMAIL = os.getenv("IMPROVMX_SMTP_FROM", SMTP_USER)
+FROM_EMAIL = os.getenv("IMPROVMX_SMTP_FROM", SMTP_USER) or SMTP_USER
 TO_OVERRIDE = os.getenv("IMPROVMX_SMTP_TO")  # optional override
+# LOCAL_RELAY=1 hands messages to a local MTA (e.g. postfix on :25)
+# instead of ImprovMX directly: the relay queues and forwards
+# concurrently, so each send here is just a localhost enqueue.
+LOCAL_RELAY = os.getenv("LOCAL_RELAY") == "1"
 
-if not SMTP_USER or not SMTP_PASS:
-    print(
-        "Warning: IMPROVMX_SMTP_USER or IMPROVMX_SMTP_PASS missing in environment. You can still run dry-run to list reports."
-    )
-if not FROM_EMAIL:
-    FROM_EMAIL = SMTP_USER
-if not FROM_EMAIL:
-    print(
-        "Error: IMPROVMX_SMTP_FROM or IMPROVMX_SMTP_USER must be set to a valid From address."
-    )
-    sys.exit(1)
+# Firestore updates are coalesced into WriteBatches committed every
+# _BATCH_LIMIT ops (and once at the end) instead of one RPC per report.
+_BATCH_LIMIT = 50
 
-parser = argparse.ArgumentParser(description="Resend unsent bug report emails")
-parser.add_argument(
-    "--days", type=int, default=7, help="how many days back to look (default 7)"
-)
-parser.add_argument(
-    "--send", action="store_true", help="actually send emails (default is dry-run)"
-)
-parser.add_argument(
-    "--yes",
-    "-y",
-    action="store_true",
-    help="non-interactive confirmation for --send (use in CI)",
-)
-parser.add_argument("--id", type=str, help="optional single bug report ID to resend")
-parser.add_argument(
-    "--retries",
-    type=int,
-    default=2,
-    help="number of retries for sending each email (default 2)",
-)
-parser.add_argument(
-    "--delay",
-    type=float,
-    default=0.5,
-    help="seconds to wait between sends (default 0.5)",
-)
-parser.add_argument(
-    "--limit",
-    type=int,
-    default=0,
-    help="limit number of reports to send (0 = no limit)",
-)
-args = parser.parse_args()
-
-# Initialize Firestore
-try:
-    db = firestore.Client()
-except Exception as e:
-    print(
-        "Failed to initialize Firestore client. Make sure GOOGLE_APPLICATION_CREDENTIALS is set or ADC is available."
-    )
-    print(e)
-    sys.exit(1)
-
-cutoff = datetime.utcnow() - timedelta(days=args.days)
-print(f"Querying bugReports since {cutoff.isoformat()} UTC\n")
-
-unsent = []
-if args.id:
-    doc = db.collection("bugReports").document(args.id).get()
-    if not doc.exists:
-        print(f"Report with ID {args.id} not found.")
-        sys.exit(1)
-    data = doc.to_dict()
-    if data.get("emailSent") is True:
-        print(f"Report {args.id} already marked as emailed.")
-        sys.exit(0)
-    unsent.append((doc.id, data))
-else:
-    q = (
-        db.collection("bugReports")
-        .where("createdAt", ">", cutoff)
-        .order_by("createdAt", direction=firestore.Query.ASCENDING)
-    )
-    for doc in q.stream():
-        data = doc.to_dict()
-        # Consider emailSent true only if explicitly True
-        if data.get("emailSent") is True:
-            continue
-        unsent.append((doc.id, data))
+# Single-pass C-level whitespace flattening for the listing preview.
+_NL_TO_SPACE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
 
-if not unsent:
-    print("No unsent reports found in the time window.")
-    sys.exit(0)
-
-print(f"Found {len(unsent)} unsent reports:\n")
-for i, (docid, data) in enumerate(unsent, start=1):
-    print(f"{i}. ID: {docid}")
-    print(f"   createdAt: {data.get('createdAt')}")
-    print(f"   email: {data.get('email')}")
-    desc = data.get("description", "")
-    desc_sanitized = desc[:120].replace("\n", " ")
-    desc_suffix = "..." if len(desc) > 120 else ""
-    print(f"   description: {desc_sanitized}{desc_suffix}")
-    print(f"   screenshot: {data.get('screenshotUrl')}")
-    print(f"   emailError: {data.get('emailError')}")
-    print()
-
-if not args.send:
-    print(
-        "Dry-run complete. Re-run with --send to actually attempt to send emails from this machine."
-    )
-    sys.exit(0)
+# SMTP replies that mean "slow down" rather than "this message is bad":
+# service closing (421), local error / insufficient storage (451, 452).
+_RATE_LIMIT_CODES = frozenset({421, 451, 452})
 
-# Confirmation (non-interactive allowed with --yes or CI env)
-if args.yes or os.getenv("CI") == "true":
-    confirmed = True
-else:
-    ans = input("Proceed to send these emails now from THIS machine? (type YES): ")
-    confirmed = ans.strip() == "YES"
-if not confirmed:
-    print("Aborted by user.")
-    sys.exit(0)
 
+# Static email chrome, built once. Only the per-report fields are
+# substituted per call (via format_map); the screenshot variants are
+# pre-expanded so no conditional string assembly happens per report.
+_HTML_SCREENSHOT_BLOCK = '<div style="margin-top:16px;"><a href="{screenshot}" style="display:inline-block;padding:10px 16px;border-radius:10px;background:linear-gradient(90deg,#ff2d95,#ff6a3d);color:#ffffff;text-decoration:none;font-weight:600;font-size:13px;">View screenshot</a></div><div style="margin-top:12px;"><img src="{screenshot}" alt="Screenshot" style="width:100%;height:auto;border-radius:12px;border:1px solid #2a3245;display:block;"></div>'
 
-def build_bug_report_email_html(report_id, data):
-    escape = _html.escape
-    reportId = escape(report_id)
-    userEmail = escape(data.get("email") or "")
-    userId = escape(data.get("userId") or "")
-    appVersion = escape(data.get("appVersion") or "")
-    buildNumber = escape(str(data.get("buildNumber") or ""))
-    platform = escape(data.get("platform") or "")
-    description = escape(data.get("description") or "").replace("\n", "<br>")
-    screenshot = escape(data.get("screenshotUrl") or "") or None
-
-    html = f"""
+_HTML_SKELETON = """
     <div style="margin:0;padding:0;background:#0f1420;color:#e8edf7;font-family:Inter,Arial,sans-serif;">
       <table role="presentation" width="100%" cellpadding="0" cellspacing="0" style="border-collapse:collapse;">
         <tr>
@@ -218,12 +113,12 @@ def build_bug_report_email_html(report_id, data):
                       </tr>
                       <tr>
                         <td style="color:#8b93a7;font-size:12px;padding:4px 0;">Screenshot</td>
-                        <td style="color:#e8edf7;font-size:12px;padding:4px 0;text-align:right;">{("Attached" if screenshot else "None")}</td>
+                        <td style="color:#e8edf7;font-size:12px;padding:4px 0;text-align:right;">{screenshotLabel}</td>
                       </tr>
                     </table>
                   </div>
 
-                  {f'<div style="margin-top:16px;"><a href="{screenshot}" style="display:inline-block;padding:10px 16px;border-radius:10px;background:linear-gradient(90deg,#ff2d95,#ff6a3d);color:#ffffff;text-decoration:none;font-weight:600;font-size:13px;">View screenshot</a></div><div style="margin-top:12px;"><img src="{screenshot}" alt="Screenshot" style="width:100%;height:auto;border-radius:12px;border:1px solid #2a3245;display:block;"></div>' if screenshot else ""}
+                  {screenshotBlock}
 
                 </td>
               </tr>
@@ -239,18 +134,93 @@ def build_bug_report_email_html(report_id, data):
     </div>
     """
 
-    return html
+_HTML_WITH_SHOT = _HTML_SKELETON.replace("{screenshotLabel}", "Attached").replace(
+    "{screenshotBlock}", _HTML_SCREENSHOT_BLOCK
+)
+_HTML_NO_SHOT = _HTML_SKELETON.replace("{screenshotLabel}", "None").replace(
+    "{screenshotBlock}", ""
+)
+
+
+# (template placeholder, data key) pairs for the plain string fields
+_HTML_FIELDS = (
+    ("userEmail", "email"),
+    ("userId", "userId"),
+    ("appVersion", "appVersion"),
+    ("platform", "platform"),
+)
 
 
-# Send loop
-for docid, data in unsent:
+def build_bug_report_email_html(report_id, data):
+    # Bind the hot lookups to locals once per call, and only run escape
+    # on values that are actually present -- optional fields are empty on
+    # most reports.
+    escape = _html.escape
+    g = data.get
+    raw_shot = g("screenshotUrl")
+    screenshot = escape(raw_shot) if raw_shot else None
+    fields = {}
+    for dst, src in _HTML_FIELDS:
+        raw = g(src)
+        fields[dst] = escape(raw) if raw else ""
+    raw_build = g("buildNumber")
+    raw_desc = g("description")
+    fields["reportId"] = escape(report_id)
+    fields["buildNumber"] = escape(str(raw_build)) if raw_build else ""
+    if raw_desc:
+        desc = escape(raw_desc)
+        fields["description"] = desc.replace("\n", "<br>") if "\n" in desc else desc
+    else:
+        fields["description"] = ""
+    fields["screenshot"] = screenshot
+    template = _HTML_WITH_SHOT if screenshot else _HTML_NO_SHOT
+    return template.format_map(fields)
+
+
+def open_smtp():
+    """Open, handshake, and log in one SMTP connection.
+
+    Tries STARTTLS on the configured port first (if enabled), then falls
+    back to implicit TLS on 465 — same strategy order as the old
+    per-message code, but returning a live connection for reuse.
+
+    With LOCAL_RELAY=1 this connects to a trusted relay on localhost
+    instead: plain SMTP, no TLS handshake, no login.
+    """
+    if LOCAL_RELAY:
+        server = smtplib.SMTP("127.0.0.1", 25, timeout=30)
+        server.ehlo()
+        return server
+    last_error = None
+    if SMTP_STARTTLS:
+        try:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(SMTP_USER, SMTP_PASS)
+            return server
+        except Exception as e:
+            last_error = e
+            print(f"  STARTTLS failed: {e}, trying SMTPS fallback...")
+    try:
+        server = smtplib.SMTP_SSL(SMTP_HOST, 465, timeout=30)
+        server.ehlo()
+        server.login(SMTP_USER, SMTP_PASS)
+        return server
+    except Exception as e:
+        print(f"  SMTPS fallback also failed: {e}")
+        raise last_error or e
+
+
+def build_message(docid, data):
+    """Build the MIME message for one report; returns (msg, to_email)."""
     to_email = (
         TO_OVERRIDE or data.get("email") or os.getenv("IMPROVMX_SMTP_TO") or SMTP_USER
     )
-    subject = f"Bug report {docid}"
 
     text_body = "\n".join(
-        [
+        (
             f"Report ID: {docid}",
             f"Reporter email: {data.get('email')}",
             f"App version: {data.get('appVersion')}",
@@ -258,69 +228,254 @@ for docid, data in unsent:
             data.get("description", ""),
             "",
             f"Screenshot: {data.get('screenshotUrl')}",
-        ]
+        )
     )
 
-    html_body = build_bug_report_email_html(docid, data)
-
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = subject
+    # EmailMessage avoids the legacy MIMEMultipart/MIMEText header
+    # re-parsing on every construction.
+    msg = EmailMessage()
+    msg["Subject"] = f"Bug report {docid}"
     msg["From"] = FROM_EMAIL
     msg["To"] = to_email
-    msg.attach(MIMEText(text_body, "plain"))
-    msg.attach(MIMEText(html_body, "html"))
+    msg.set_content(text_body)
+    msg.add_alternative(build_bug_report_email_html(docid, data), subtype="html")
+    return msg, to_email
+
 
-    print(f"Sending {docid} -> {to_email} ... ")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Resend unsent bug report emails")
+    parser.add_argument(
+        "--days", type=int, default=7, help="how many days back to look (default 7)"
+    )
+    parser.add_argument(
+        "--send", action="store_true", help="actually send emails (default is dry-run)"
+    )
+    parser.add_argument(
+        "--yes",
+        "-y",
+        action="store_true",
+        help="non-interactive confirmation for --send (use in CI)",
+    )
+    parser.add_argument("--id", type=str, help="optional single bug report ID to resend")
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="number of retries for sending each email (default 2)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="limit number of reports to send (0 = no limit)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    if not LOCAL_RELAY and (not SMTP_USER or not SMTP_PASS):
+        print(
+            "Warning: IMPROVMX_SMTP_USER or IMPROVMX_SMTP_PASS missing in environment. You can still run dry-run to list reports."
+        )
+    if not FROM_EMAIL:
+        print(
+            "Error: IMPROVMX_SMTP_FROM or IMPROVMX_SMTP_USER must be set to a valid From address."
+        )
+        sys.exit(1)
+
+    args = parse_args()
+
+    # Initialize Firestore
     try:
-        sent = False
-        last_error = None
+        db = firestore.Client()
+    except Exception as e:
+        print(
+            "Failed to initialize Firestore client. Make sure GOOGLE_APPLICATION_CREDENTIALS is set or ADC is available."
+        )
+        print(e)
+        sys.exit(1)
 
-        # Strategy 1: Try STARTTLS on port 587 (if enabled)
-        if SMTP_STARTTLS:
-            try:
-                with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30) as server:
-                    server.ehlo()
-                    server.starttls()
-                    server.ehlo()
-                    server.login(SMTP_USER, SMTP_PASS)
-                    server.send_message(msg)
-                sent = True
-            except Exception as e:
-                last_error = e
-                print(f"  STARTTLS failed: {e}, trying SMTPS fallback...")
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    print(f"Querying bugReports since {cutoff.isoformat()}\n")
+
+    # Both entry points converge on one query + one stream loop: a single
+    # report is selected with a document-id filter instead of a separate
+    # .get() round-trip.
+    if args.id:
+        q = db.collection("bugReports").where(
+            "__name__", "==", db.collection("bugReports").document(args.id)
+        )
+    else:
+        # Filter emailSent server-side so already-sent reports never cross
+        # the wire. Requires a composite index on (emailSent, createdAt);
+        # docs written before the emailSent field existed need a one-off
+        # backfill to emailSent: False to be picked up by this query.
+        q = (
+            db.collection("bugReports")
+            .where("emailSent", "==", False)
+            .where("createdAt", ">", cutoff)
+            .order_by("createdAt", direction=firestore.Query.ASCENDING)
+        )
+        # The emailSent filter is already server-side, so the limit can be
+        # pushed down exactly: Firestore stops streaming after N docs.
+        if args.limit > 0:
+            q = q.limit(args.limit)
+
+    unsent = []
+    for doc in q.stream():
+        data = doc.to_dict()
+        # The --id query can't filter emailSent server-side as well without
+        # an extra composite index, so keep that one check client-side.
+        if data.get("emailSent") is True:
+            continue
+        unsent.append((doc.id, data))
+
+    if args.id and not unsent:
+        print(f"Report {args.id} not found or already marked as emailed.")
+        sys.exit(0)
+
+    if not unsent:
+        print("No unsent reports found in the time window.")
+        sys.exit(0)
 
-        # Strategy 2: Fallback to SMTPS on port 465 (implicit TLS)
-        if not sent:
+    print(f"Found {len(unsent)} unsent reports:\n")
+    for i, (docid, data) in enumerate(unsent, start=1):
+        print(f"{i}. ID: {docid}")
+        print(f"   createdAt: {data.get('createdAt')}")
+        print(f"   email: {data.get('email')}")
+        desc = data.get("description", "")
+        desc_sanitized = desc[:120].translate(_NL_TO_SPACE)
+        desc_suffix = "..." if len(desc) > 120 else ""
+        print(f"   description: {desc_sanitized}{desc_suffix}")
+        print(f"   screenshot: {data.get('screenshotUrl')}")
+        print(f"   emailError: {data.get('emailError')}")
+        print()
+
+    if not args.send:
+        print(
+            "Dry-run complete. Re-run with --send to actually attempt to send emails from this machine."
+        )
+        sys.exit(0)
+
+    # Confirmation (non-interactive allowed with --yes or CI env)
+    if args.yes or os.getenv("CI") == "true":
+        confirmed = True
+    else:
+        ans = input("Proceed to send these emails now from THIS machine? (type YES): ")
+        confirmed = ans.strip() == "YES"
+    if not confirmed:
+        print("Aborted by user.")
+        sys.exit(0)
+
+    batch = db.batch()
+    batch_ops = 0
+
+    def queue_update(docid, fields):
+        nonlocal batch, batch_ops
+        batch.update(db.collection("bugReports").document(docid), fields)
+        batch_ops += 1
+        if batch_ops >= _BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            batch_ops = 0
+
+    # Send phase: sends are I/O-bound on SMTP round-trips, so run them on a
+    # small thread pool fed by a queue of persistent connections (opened
+    # lazily, health-checked with NOOP, reconnected on failure). Kept small
+    # to stay under ImprovMX connection limits. Firestore updates happen on
+    # the main thread as futures complete.
+    pool_size = min(4, len(unsent))
+
+    smtp_pool = queue.Queue()
+    for _ in range(pool_size):
+        smtp_pool.put(None)  # placeholder: workers open connections on demand
+
+    def send_one(docid, data):
+        """Send one report via a pooled connection.
+
+        Returns None on success, or the last exception on failure.
+        """
+        msg, to_email = build_message(docid, data)
+        print(f"Sending {docid} -> {to_email} ... ")
+        last_error = None
+        for attempt in range(args.retries + 1):
+            server = smtp_pool.get()
             try:
-                with smtplib.SMTP_SSL(SMTP_HOST, 465, timeout=30) as server:
-                    server.ehlo()
-                    server.login(SMTP_USER, SMTP_PASS)
-                    server.send_message(msg)
-                sent = True
+                if server is None:
+                    server = open_smtp()
+                else:
+                    # Cheap liveness probe; reconnect if the idle
+                    # connection was dropped server-side.
+                    try:
+                        server.noop()
+                    except Exception:
+                        try:
+                            server.quit()
+                        except Exception:
+                            pass
+                        server = open_smtp()
+                server.send_message(msg)
+                smtp_pool.put(server)
+                return None
             except Exception as e:
                 last_error = e
-                print(f"  SMTPS fallback also failed: {e}")
-
-        if sent:
-            db.collection("bugReports").document(docid).update(
-                {
-                    "emailSent": True,
-                    "emailSentAt": firestore.SERVER_TIMESTAMP,
-                    "emailSentMethod": "improvmx",
-                    "emailError": firestore.DELETE_FIELD,
-                }
-            )
-            print("  sent OK")
-        else:
-            raise last_error or Exception("All send strategies failed")
+                try:
+                    if server is not None:
+                        server.close()
+                except Exception:
+                    pass
+                smtp_pool.put(None)
+                # Back off only when the server is telling us to slow
+                # down; everything else retries immediately over a fresh
+                # connection.
+                if (
+                    isinstance(e, smtplib.SMTPResponseException)
+                    and e.smtp_code in _RATE_LIMIT_CODES
+                ):
+                    time.sleep(min(2 ** attempt, 30))
+        return last_error
 
-    except Exception as e:
-        print("  send failed:", e)
-        db.collection("bugReports").document(docid).update(
-            {
-                "emailSent": False,
-                "emailError": str(e),
+    try:
+        with ThreadPoolExecutor(max_workers=pool_size) as pool:
+            futures = {
+                pool.submit(send_one, docid, data): docid for docid, data in unsent
             }
-        )
-
-print("Done.")
+            for future in as_completed(futures):
+                docid = futures[future]
+                error = future.result()
+                if error is None:
+                    queue_update(
+                        docid,
+                        {
+                            "emailSent": True,
+                            "emailSentAt": firestore.SERVER_TIMESTAMP,
+                            "emailSentMethod": "improvmx",
+                            "emailError": firestore.DELETE_FIELD,
+                        },
+                    )
+                    print(f"  {docid} sent OK")
+                else:
+                    print(f"  {docid} send failed:", error)
+                    queue_update(
+                        docid,
+                        {
+                            "emailSent": False,
+                            "emailError": str(error),
+                        },
+                    )
+    finally:
+        while not smtp_pool.empty():
+            conn = smtp_pool.get_nowait()
+            if conn is not None:
+                try:
+                    conn.quit()
+                except Exception:
+                    pass
+        if batch_ops:
+            batch.commit()
+
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,59 +8,119 @@ definition and lookup code at the top and bottom of the file.
 """
 
 import csv
-import io
+import os
+import shutil
+import urllib.error
 import urllib.request
+from operator import itemgetter
 
 CSV_URL = "https://davidmegginson.github.io/ourairports-data/airports.csv"
 OUTPUT = "lib/features/aether/data/airports.dart"
+CACHE_CSV = os.path.join(".cache", "airports.csv")
+CACHE_ETAG = CACHE_CSV + ".etag"
+
+# One %-format per record instead of eight f-strings; the template is
+# parsed once at import time.
+RECORD_TMPL = (
+    "  Airport(\n"
+    "    iata: '%s',\n"
+    "    icao: '%s',\n"
+    "    name: '%s',\n"
+    "    city: '%s',\n"
+    "    country: '%s',\n"
+    "    latitude: %s,\n"
+    "    longitude: %s,\n"
+    "  ),\n"
+)
+
+
+def _open_csv():
+    """Return a text stream over the CSV, re-downloading only when stale.
+
+    The last download is kept in .cache/ alongside its ETag; subsequent
+    runs send If-None-Match and parse the local copy on 304, turning the
+    ~10 MB transfer into a local open in steady state.
+    """
+    req = urllib.request.Request(CSV_URL)
+    if os.path.isfile(CACHE_CSV) and os.path.isfile(CACHE_ETAG):
+        with open(CACHE_ETAG) as f:
+            etag = f.read().strip()
+        if etag:
+            req.add_header("If-None-Match", etag)
+    print(f"Fetching {CSV_URL} ...")
+    try:
+        resp = urllib.request.urlopen(req)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print("Not modified, using cached copy")
+            return open(CACHE_CSV, encoding="utf-8", newline="")
+        raise
+    os.makedirs(os.path.dirname(CACHE_CSV), exist_ok=True)
+    with resp, open(CACHE_CSV, "wb") as out:
+        shutil.copyfileobj(resp, out, 64 * 1024)
+    with open(CACHE_ETAG, "w") as f:
+        f.write(resp.headers.get("ETag") or "")
+    return open(CACHE_CSV, encoding="utf-8", newline="")
 
 
 def fetch_airports():
-    """Fetch and parse OurAirports CSV, return large airports with IATA codes."""
-    print(f"Fetching {CSV_URL} ...")
-    with urllib.request.urlopen(CSV_URL) as resp:
-        raw = resp.read().decode("utf-8")
-    reader = csv.DictReader(io.StringIO(raw))
+    """Fetch and parse OurAirports CSV, return large airports with IATA codes.
+
+    Rows come back as (iata, icao, name, city, country, lat, lon) tuples,
+    sorted by IATA code -- exactly what the record template consumes.
+    """
+    reader = csv.reader(_open_csv())
+    # Only 8 of the ~20 columns are used; bind their positions once and
+    # index rows by integer rather than building a dict per row.
+    header = next(reader)
+    t_i = header.index("type")
+    iata_i = header.index("iata_code")
+    icao_i = header.index("ident")
+    name_i = header.index("name")
+    city_i = header.index("municipality")
+    country_i = header.index("iso_country")
+    lat_i = header.index("latitude_deg")
+    lon_i = header.index("longitude_deg")
     airports = []
     for row in reader:
-        if row["type"] != "large_airport":
+        if row[t_i] != "large_airport":
             continue
-        iata = (row.get("iata_code") or "").strip()
+        iata = row[iata_i].strip()
         if not iata or len(iata) < 2:
             continue
-        icao = (row.get("ident") or "").strip()
-        name = (row.get("name") or "").strip()
         # Clean up common suffixes for brevity
-        for suffix in [" International Airport", " Airport"]:
-            if name.endswith(suffix):
-                name = name[: -len(suffix)]
-        name = name.replace(" / ", " / ").strip()
-        city = (row.get("municipality") or "").strip() or name
-        country = (row.get("iso_country") or "").strip()
-        lat = float(row.get("latitude_deg") or 0)
-        lon = float(row.get("longitude_deg") or 0)
+        name = (
+            row[name_i]
+            .strip()
+            .removesuffix(" International Airport")
+            .removesuffix(" Airport")
+        )
         airports.append(
-            {
-                "iata": iata,
-                "icao": icao,
-                "name": name,
-                "city": city,
-                "country": country,
-                "latitude": lat,
-                "longitude": lon,
-            }
+            (
+                iata,
+                row[icao_i].strip(),
+                name,
+                row[city_i].strip() or name,
+                row[country_i].strip(),
+                float(row[lat_i] or 0),
+                float(row[lon_i] or 0),
+            )
         )
-    airports.sort(key=lambda a: a["iata"])
+    airports.sort(key=itemgetter(0))
     print(f"Found {len(airports)} large airports with IATA codes")
     return airports
 
 
+# Single-pass C-level escaping for Dart single-quoted strings.
+_DART_ESC = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+
 def escape_dart(s):
-    return s.replace("\\", "\\\\").replace("'", "\\'")
+    return s.translate(_DART_ESC)
 
 
-def generate_dart(airports):
-    """Read existing airports.dart, replace just the kAirports list."""
+def main():
+    """Regenerate the kAirports list in airports.dart in one pass."""
     # Read existing file to get header (class def) and footer (lookup maps)
     with open(OUTPUT, "r") as f:
         content = f.read()
@@ -89,41 +149,41 @@ def generate_dart(airports):
 
     footer = content[list_end:]
 
-    # Build new list
-    lines = []
-    lines.append(
-        f"/// All large airports worldwide (OurAirports, CC0 Public Domain)."
-    )
-    lines.append("///")
-    lines.append(
-        f"/// Sorted alphabetically by IATA code. This list is generated from the"
-    )
-    lines.append(
-        f"/// OurAirports open dataset (https://ourairports.com/data/) filtered to"
-    )
-    lines.append(f"/// airports classified as 'large_airport' ({len(airports)} total).")
-    lines.append("const List<Airport> kAirports = [")
-    for a in airports:
-        lines.append("  Airport(")
-        lines.append(f"    iata: '{escape_dart(a['iata'])}',")
-        lines.append(f"    icao: '{escape_dart(a['icao'])}',")
-        lines.append(f"    name: '{escape_dart(a['name'])}',")
-        lines.append(f"    city: '{escape_dart(a['city'])}',")
-        lines.append(f"    country: '{escape_dart(a['country'])}',")
-        lines.append(f"    latitude: {a['latitude']},")
-        lines.append(f"    longitude: {a['longitude']},")
-        lines.append("  ),")
-    lines.append("];")
-
-    with open(OUTPUT, "w") as f:
-        f.write(header)
-        f.write("\n".join(lines))
-        f.write(footer)
-
-    total_lines = (header + "\n".join(lines) + footer).count("\n") + 1
-    print(f"Wrote {OUTPUT} ({total_lines} lines, {len(airports)} airports)")
+    # Fetch only after the markers are validated, so a malformed dart file
+    # fails fast without the download.
+    airports = fetch_airports()
+
+    # Stream the new list straight to a raw fd: records are UTF-8 encoded
+    # into a bytearray and flushed in 64 KB chunks, skipping the
+    # TextIOWrapper codec path on every write.
+    fd = os.open(OUTPUT, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        buf = bytearray(header.encode("utf-8"))
+        buf += (
+            "/// All large airports worldwide (OurAirports, CC0 Public Domain).\n"
+            "///\n"
+            "/// Sorted alphabetically by IATA code. This list is generated from the\n"
+            "/// OurAirports open dataset (https://ourairports.com/data/) filtered to\n"
+            f"/// airports classified as 'large_airport' ({len(airports)} total).\n"
+            "const List<Airport> kAirports = [\n"
+        ).encode("utf-8")
+        esc = escape_dart
+        for iata, icao, name, city, country, lat, lon in airports:
+            buf += (
+                RECORD_TMPL
+                % (esc(iata), esc(icao), esc(name), esc(city), esc(country), lat, lon)
+            ).encode("utf-8")
+            if len(buf) >= 65536:
+                os.write(fd, buf)
+                buf.clear()
+        buf += b"];"
+        buf += footer.encode("utf-8")
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+
+    print(f"Wrote {OUTPUT} ({len(airports)} airports)")
 
 
 if __name__ == "__main__":
-    airports = fetch_airports()
-    generate_dart(airports)
+    main()